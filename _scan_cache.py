@@ -0,0 +1,60 @@
+import os
+import pickle
+
+try:
+    from appdirs import user_cache_dir
+except ImportError:
+    user_cache_dir = None
+
+APP_NAME = "DavinciResolveBinCreator"
+CACHE_FILE_NAME = "scan_cache.pickle"
+
+def _cache_path():
+    """Get the cache file location in the user's cache directory"""
+    if user_cache_dir:
+        cache_dir = user_cache_dir(APP_NAME)
+    else:
+        base_dir = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(base_dir, APP_NAME)
+    return os.path.join(cache_dir, CACHE_FILE_NAME)
+
+def load():
+    """Load the {folder_path: (mtime_ns, video_names)} cache, or an empty one"""
+    try:
+        with open(_cache_path(), "rb") as f:
+            cache = pickle.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error loading scan cache: {str(e)}")
+        return {}
+
+def prune(cache, root_folder):
+    """Drop cached folders that no longer exist or are not inside root_folder"""
+    root = os.path.join(os.path.normcase(os.path.abspath(root_folder)), "")
+    for folder_path in list(cache):
+        if (not os.path.normcase(os.path.abspath(folder_path)).startswith(root)
+                or not os.path.isdir(folder_path)):
+            del cache[folder_path]
+
+def clear():
+    """Delete the cache file if there is one"""
+    try:
+        os.remove(_cache_path())
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Error clearing scan cache: {str(e)}")
+
+def save(cache):
+    """Write the cache to disk, replacing the previous file atomically"""
+    path = _cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cache, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error saving scan cache: {str(e)}")
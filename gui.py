@@ -1,12 +1,26 @@
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, filedialog
+from tkinter import ttk, filedialog, messagebox
 from functools import partial
 
+LOG_FLUSH_INTERVAL_MS = 50  # How often queued log messages are written to the widget
+
 class BinCreatorGUI:
-    def __init__(self, root, app):
-        self.app = app
+    def __init__(self, root, on_create_bins, on_clear_cache):
+        self.on_create_bins = on_create_bins  # Called as on_create_bins(root_folder, gui, use_scan_cache)
+        self.on_clear_cache = on_clear_cache  # Called as on_clear_cache(gui)
         self.root = root
+        self._max_log_lines = 5000  # Oldest lines are dropped past this
+        self._log_queue = queue.Queue()
+        self._dialog_queue = queue.Queue()
+        self._task_queue = queue.Queue()
+        self._run_done = threading.Event()  # Set by the worker, handled by the flush timer
         self.setup_ui()
+        self._schedule_flush()
+        
+        # Resolve work runs here so the Tk main loop stays responsive
+        threading.Thread(target=self._worker, daemon=True).start()
     
     def setup_ui(self):
         """Configure all GUI elements"""
@@ -82,17 +96,33 @@ class BinCreatorGUI:
         btn_frame = ttk.Frame(self.main_frame)
         btn_frame.pack(fill=tk.X, pady=10)
         
-        ttk.Button(
+        self.create_btn = ttk.Button(
             btn_frame,
             text="Create Media Bins",
-            command=self.app.create_media_bins
-        ).pack(side=tk.LEFT, padx=5)
+            command=self._on_create_bins
+        )
+        self.create_btn.pack(side=tk.LEFT, padx=5)
         
         ttk.Button(
             btn_frame,
             text="Clear Log",
             command=self.clear_log
         ).pack(side=tk.LEFT, padx=5)
+        
+        self.clear_cache_btn = ttk.Button(
+            btn_frame,
+            text="Clear Scan Cache",
+            command=self._on_clear_cache
+        )
+        self.clear_cache_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Off by default: folder times are unreliable on FAT/exFAT cards and new files could be missed
+        self.use_cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            btn_frame,
+            text="Reuse unchanged folder scans",
+            variable=self.use_cache_var
+        ).pack(side=tk.LEFT, padx=5)
 
     def _setup_status_bar(self):
         """Set up status bar"""
@@ -113,16 +143,76 @@ class BinCreatorGUI:
         """Public method to get the current folder path"""
         return self.folder_entry.get()
 
+    def show_dialog(self, kind, title, message):
+        """Public method to show a messagebox dialog (safe to call from any thread)"""
+        self._dialog_queue.put((kind, title, message))
+
     def add_log_message(self, message):
-        """Public method to add messages to the log"""
-        self.result_text.insert(tk.END, message)
-        self.result_text.see(tk.END)
-        self.result_text.update_idletasks()
+        """Public method to add messages to the log (safe to call from any thread)"""
+        self._log_queue.put(message)
+
+    def _schedule_flush(self):
+        """Write queued log messages in one insert, show queued dialogs, then re-arm the timer"""
+        messages = []
+        while True:
+            try:
+                messages.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        if messages:
+            self.result_text.insert(tk.END, ''.join(messages))
+            lines = int(self.result_text.index('end-1c').split('.')[0])
+            if lines > self._max_log_lines:
+                self.result_text.delete('1.0', f'{lines - self._max_log_lines}.0')
+            self.result_text.see(tk.END)
+        
+        while True:
+            try:
+                kind, title, message = self._dialog_queue.get_nowait()
+            except queue.Empty:
+                break
+            getattr(messagebox, kind)(title, message)
+        
+        if self._run_done.is_set():
+            self._run_done.clear()
+            self.create_btn.state(['!disabled'])
+            self.clear_cache_btn.state(['!disabled'])
+            self.update_status("Ready")
+        
+        self.root.after(LOG_FLUSH_INTERVAL_MS, self._schedule_flush)
 
     def clear_log(self):
         """Public method to clear the log"""
         self.result_text.delete(1.0, tk.END)
 
+    def _on_create_bins(self):
+        """Hand the selected folder to the worker thread"""
+        self._run_task("Creating media bins...", partial(
+            self.on_create_bins, self.get_folder_path(), self, self.use_cache_var.get()))
+
+    def _on_clear_cache(self):
+        """Clear the scan cache on the worker thread so it never overlaps a run"""
+        self._run_task("Clearing scan cache...", partial(self.on_clear_cache, self))
+
+    def _run_task(self, status, task):
+        """Queue a task for the worker, disabling the buttons until it finishes"""
+        self.create_btn.state(['disabled'])
+        self.clear_cache_btn.state(['disabled'])
+        self.update_status(status)
+        self._task_queue.put(task)
+
+    def _worker(self):
+        """Run queued tasks one at a time"""
+        while True:
+            task = self._task_queue.get()
+            try:
+                task()
+            except Exception as e:
+                self.show_dialog("showerror", "Error", f"Unexpected error: {str(e)}")
+            finally:
+                self._run_done.set()
+
     def _browse_folder(self):
         """Handle folder browsing"""
         if folder_path := filedialog.askdirectory():
@@ -1,13 +1,28 @@
 import DaVinciResolveScript as dvr
+import asyncio
 import os
 import re
+from collections import deque
 from datetime import datetime
-from tkinter import messagebox
+from logging import DEBUG, INFO
+
+import _scan_cache
 
 DATE_PATTERN = r"\d{4}-\d{2}-\d{2}"
 FOLDER_DATE_PATTERN = r"\s*\d{1,2}/\d{1,2}/\d{4}.*$"
 VIDEO_EXTENSIONS = ('.mp4', '.mov', '.mxf', '.avi')  # Supported video formats
-LOAD_NUMBER_PATTERN = r"L(\d+)$"  # Pattern to extract load number from bin name
+LOAD_NUMBER_PATTERN = r"L(\d+)$"  # Pattern to extract load number from cleaned folder name
+
+_DATE_RE = re.compile(DATE_PATTERN)
+_FOLDER_DATE_RE = re.compile(FOLDER_DATE_PATTERN)
+_LOAD_RE = re.compile(LOAD_NUMBER_PATTERN)
+_NUM_RE = re.compile(r"\d+")
+_VIDEO_EXT_SET = frozenset(VIDEO_EXTENSIONS)
+
+def _is_video_name(name):
+    """Check a file name against the supported video extensions"""
+    dot = name.rfind('.')
+    return dot >= 0 and name[dot:].lower() in _VIDEO_EXT_SET
 
 def get_resolve_objects():
     """Safely get Resolve objects with error handling"""
@@ -19,86 +34,148 @@ def get_resolve_objects():
         print(f"Error getting Resolve objects: {str(e)}")
         return None, None, None
 
+class _LevelLogger:
+    """Send log messages at or above a level to the GUI, formatting them only when sent"""
+    def __init__(self, write, level=INFO):
+        self.write = write
+        self.level = level
+    
+    def enabled_for(self, level):
+        return level >= self.level
+    
+    def log(self, level, message, *args):
+        if not self.enabled_for(level):
+            return
+        self.write(message % args if args else message)
+    
+    def debug(self, message, *args):
+        self.log(DEBUG, message, *args)
+    
+    def info(self, message, *args):
+        self.log(INFO, message, *args)
+
 class BinCreatorApp:
     def __init__(self):
-        self.gui = None
+        self.log_level = INFO  # Set to DEBUG to log every bin and import
+        self._log = None
         self.resolve, self.project, self.media_pool = get_resolve_objects()
+        self._bin_index = {}
+        self._scan_cache = _scan_cache.load()
     
-    def create_media_bins(self):
-        """Main function to create media bins"""
+    def create_media_bins(self, root_folder, gui, use_scan_cache=False):
+        """Main function to create media bins (runs on the GUI's worker thread)"""
+        self._log = _LevelLogger(gui.add_log_message, self.log_level)
+        try:
+            return asyncio.run(self._create_media_bins(root_folder, gui, use_scan_cache))
+        finally:
+            self._log = None  # Keep no reference to the GUI between runs
+    
+    def clear_scan_cache(self, gui):
+        """Forget all cached folder scans, in memory and on disk"""
+        self._scan_cache.clear()
+        _scan_cache.clear()
+        gui.add_log_message("Scan cache cleared\n")
+    
+    async def _create_media_bins(self, root_folder, gui, use_scan_cache):
+        """Create media bins, scanning subfolders on disk while Resolve is queried"""
         try:
-            root_folder = self.gui.folder_entry.get()
-        
             if not root_folder:
-                messagebox.showerror("Error", "Please select a folder first")
+                gui.show_dialog("showerror", "Error", "Please select a folder first")
                 return []
 
             if not os.path.isdir(root_folder):
-                messagebox.showerror("Error", f"Folder not found: {root_folder}")
+                gui.show_dialog("showerror", "Error", f"Folder not found: {root_folder}")
                 return []
 
             if not self.media_pool:
-                messagebox.showwarning("Warning", "Not connected to DaVinci Resolve")
+                gui.show_dialog("showwarning", "Warning", "Not connected to DaVinci Resolve")
                 return []
 
             root_folder_name = os.path.basename(root_folder)
-            date_match = re.search(DATE_PATTERN, root_folder_name)
+            date_match = _DATE_RE.search(root_folder_name)
             date_prefix = date_match.group(0) if date_match else datetime.now().strftime("%Y-%m-%d")
 
+            # Scan the root folder once and split it into subfolders and files
+            with os.scandir(root_folder) as it:
+                root_files, subfolders = [], []
+                for entry in it:
+                    (subfolders if entry.is_dir() else root_files).append(entry)
+            if not subfolders:
+                gui.show_dialog("showinfo", "Info", "No subfolders found in selected directory")
+                return []
+
+            # Work out bin names and load numbers once, then process folders in load order
+            targets = []
+            for folder in subfolders:
+                folder_name, load_number = self._clean_and_load(folder.name)
+                if not load_number:
+                    self._log.info("Skipping folder %s - no load number found\n", folder_name)
+                    continue
+                targets.append((load_number, folder, f"{date_prefix} - {folder_name}"))
+            targets.sort(key=lambda target: target[0])
+
+            # Subfolder scans run in worker threads; Resolve calls stay on this thread
+            loop = asyncio.get_running_loop()
+            scan = self._scan_videos_cached if use_scan_cache else self._scan_videos
+            scans = [loop.run_in_executor(None, scan, folder.path)
+                     for _, folder, _ in targets]
+
             root_bin = self.media_pool.GetRootFolder()
             if not root_bin:
-                messagebox.showerror("Error", "Could not get root bin from Media Pool")
+                gui.show_dialog("showerror", "Error", "Could not get root bin from Media Pool")
                 return []
+            self._bin_index = self._index_bins(root_bin)
 
             # Find and sort all load videos in the root folder by their numerical value
-            load_videos = self._find_and_sort_load_videos(root_folder)
-            self.gui.add_log_message(f"Found {len(load_videos)} load videos in root folder\n")
-            if load_videos:
-                self.gui.add_log_message("Load videos in order:\n" + 
-                                       "\n".join(f"{i+1}: {os.path.basename(v)}" 
-                                                for i, v in enumerate(load_videos)) + "\n")
-
-            # Process subfolders
-            subfolders = [f for f in os.scandir(root_folder) if f.is_dir()]
-            if not subfolders:
-                messagebox.showinfo("Info", "No subfolders found in selected directory")
-                return []
+            load_videos = self._find_and_sort_load_videos(root_files)
+            self._log.info("Found %d load videos in root folder\n", len(load_videos))
+            if load_videos and self._log.enabled_for(DEBUG):
+                self._log.debug("Load videos in order:\n" + 
+                                "\n".join(f"{i+1}: {os.path.basename(v)}" 
+                                          for i, v in enumerate(load_videos)) + "\n")
+
+            folder_videos = await asyncio.gather(*scans)
+            if use_scan_cache:
+                _scan_cache.prune(self._scan_cache, root_folder)
+                _scan_cache.save(self._scan_cache)
 
             created_bins = []
-            updated_bins = []
+            pending = {}  # id(bin) -> (bin, bin name, file paths), imported after all folders are checked
+            existing_targets = []
             
-            for folder in subfolders:
-                folder_name = self.clean_folder_name(folder.name)
-                bin_name = f"{date_prefix} - {folder_name}"
-                load_number = self._get_load_number_from_bin(bin_name)
-                
-                if not load_number:
-                    self.gui.add_log_message(f"Skipping folder {folder_name} - no load number found\n")
-                    continue
-                
+            for (load_number, folder, bin_name), disk_files in zip(targets, folder_videos):
                 # Check if bin exists
-                bin_folder = self.find_bin_by_name(root_bin, bin_name)
+                bin_folder = self._bin_index.get(bin_name)
                 
                 if bin_folder:
-                    self.gui.add_log_message(f"Bin already exists: {bin_name} (L{load_number})\n")
-                    if self._import_vids(bin_folder, folder.path):
-                        updated_bins.append(bin_name)
-                    # Import load video to existing bin
-                    self._import_load_video(bin_folder, load_number, load_videos)
+                    self._log.debug("Bin already exists: %s (L%d)\n", bin_name, load_number)
+                    missing, existing = self.get_missing_files(bin_folder, disk_files)
+                    if self._queue_vids(bin_folder, bin_name, folder.path, missing, pending):
+                        existing_targets.append((bin_name, bin_folder))
+                    # Queue load video for the existing bin
+                    self._queue_load_video(bin_folder, bin_name, load_number, load_videos, existing, pending)
                 else:
                     try:
                         if new_bin := self.media_pool.AddSubFolder(root_bin, bin_name):
+                            self._bin_index[bin_name] = new_bin
                             created_bins.append(bin_name)
-                            self.gui.add_log_message(f"Created new bin: {bin_name} (L{load_number})\n")
-                            self._import_vids(new_bin, folder.path)
-                            # Import load video to new bin
-                            self._import_load_video(new_bin, load_number, load_videos)
+                            self._log.debug("Created new bin: %s (L%d)\n", bin_name, load_number)
+                            # A bin that was just created has no clips to compare against
+                            missing, existing = set(disk_files), set()
+                            self._queue_vids(new_bin, bin_name, folder.path, missing, pending)
+                            # Queue load video for the new bin
+                            self._queue_load_video(new_bin, bin_name, load_number, load_videos, existing, pending)
                         else:
-                            self.gui.add_log_message(f"Failed to create: {bin_name}\n")
+                            self._log.info("Failed to create: %s\n", bin_name)
                     except Exception as e:
-                        self.gui.add_log_message(f"Error creating {bin_name}: {str(e)}\n")
+                        self._log.info("Error creating %s: %s\n", bin_name, e)
                 
-                self.gui.add_log_message("\n")
+                self._log.debug("\n")
+
+            # Import the missing files straight into their bins
+            filled_bins = self._import_pending(pending, load_videos)
+            updated_bins = [name for name, bin_folder in existing_targets
+                            if id(bin_folder) in filled_bins]
 
             # Summary report
             summary = [
@@ -108,70 +185,87 @@ class BinCreatorApp:
                 f"Existing bins updated: {len(updated_bins)}",
                 f"Missing files imported: {len(created_bins) + len(updated_bins)}\n\n"
             ]
-            self.gui.add_log_message("\n".join(summary))
+            self._log.info("\n".join(summary))
             
             if created_bins:
-                self.gui.add_log_message("\nCreated bins:\n- " + "\n- ".join(created_bins) + "\n")
+                self._log.info("\nCreated bins:\n- " + "\n- ".join(created_bins) + "\n")
             if updated_bins:
-                self.gui.add_log_message("\nUpdated bins:\n- " + "\n- ".join(updated_bins) + "\n")
+                self._log.info("\nUpdated bins:\n- " + "\n- ".join(updated_bins) + "\n")
             
             return created_bins + updated_bins
 
         except Exception as e:
-            messagebox.showerror("Error", f"Unexpected error: {str(e)}")
+            gui.show_dialog("showerror", "Error", f"Unexpected error: {str(e)}")
             return []
     
     def clean_folder_name(self, folder_name):
         """Clean folder name by removing trailing dates/times"""
-        return re.sub(FOLDER_DATE_PATTERN, "", folder_name).strip()
-    
-    def find_bin_by_name(self, bin_folder, target_name):
-        """Find a bin by name in the folder structure"""
-        if bin_folder.GetName() == target_name:
-            return bin_folder
-        for subfolder in bin_folder.GetSubFolderList():
-            found = self.find_bin_by_name(subfolder, target_name)
-            if found:
-                return found
-        return None
-
-    def get_missing_files(self, bin_folder, folder_path):
-        """Compare files on disk with clips in bin and return missing files"""
+        return _FOLDER_DATE_RE.sub("", folder_name).strip()
+    
+    def _index_bins(self, root_bin):
+        """Walk the bin tree once and map each bin name to its folder"""
+        index = {}
+        queue = deque([root_bin])
+        while queue:
+            folder = queue.popleft()
+            index.setdefault(folder.GetName(), folder)
+            queue.extend(folder.GetSubFolderList())
+        return index
+
+    def _scan_videos(self, folder_path):
+        """Return the video file names in a folder"""
+        with os.scandir(folder_path) as it:
+            return frozenset(entry.name for entry in it
+                             if entry.is_file() and _is_video_name(entry.name))
+
+    def _scan_videos_cached(self, folder_path):
+        """Return the video file names in a folder, skipping the scan if its mtime is unchanged"""
+        mtime_ns = os.stat(folder_path).st_mtime_ns
+        cached = self._scan_cache.get(folder_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
+        video_names = self._scan_videos(folder_path)
+        self._scan_cache[folder_path] = (mtime_ns, video_names)
+        return video_names
+
+    def get_missing_files(self, bin_folder, disk_files):
+        """Compare pre-scanned files on disk with clips in bin.
+        
+        Returns the missing files and the clip names already in the bin.
+        """
         existing_clips = {clip.GetName() for clip in bin_folder.GetClipList()}
-        disk_files = {entry.name for entry in os.scandir(folder_path) 
-                    if entry.is_file() and entry.name.lower().endswith(VIDEO_EXTENSIONS)}
-        return disk_files - existing_clips
+        return disk_files - existing_clips, existing_clips
     
-    def _find_and_sort_load_videos(self, root_folder):
-        """Find all load videos in the root folder and sort them by their numerical value"""
+    def _find_and_sort_load_videos(self, entries):
+        """Find all load videos among the root folder entries and sort them by their numerical value"""
         load_videos = []
-        for entry in os.scandir(root_folder):
-            if entry.is_file() and entry.name.lower().endswith(VIDEO_EXTENSIONS):
-                # Extract all numbers from filename and use the largest one
-                numbers = [int(num) for num in re.findall(r'\d+', entry.name)]
-                if numbers:
-                    # Use the largest number found in filename as the key for sorting
-                    max_num = max(numbers)
+        for entry in entries:
+            if entry.is_file() and _is_video_name(entry.name):
+                # Use the largest number found in filename as the key for sorting
+                max_num = max((int(m.group()) for m in _NUM_RE.finditer(entry.name)), default=None)
+                if max_num is not None:
                     load_videos.append((max_num, entry.path))
         
         # Sort videos by their numerical value
         load_videos.sort(key=lambda x: x[0])
         return [video[1] for video in load_videos]  # Return just the sorted paths
     
-    def _get_load_number_from_bin(self, bin_name):
-        """Extract load number from bin name (e.g., 'L1' returns 1)"""
-        match = re.search(LOAD_NUMBER_PATTERN, bin_name)
-        return int(match.group(1)) if match else None
+    def _clean_and_load(self, folder_name):
+        """Clean a folder name and extract its load number (e.g., 'Alexii - Russ - L2' gives 2)"""
+        clean_name = self.clean_folder_name(folder_name)
+        match = _LOAD_RE.search(clean_name)
+        return clean_name, int(match.group(1)) if match else None
     
-    def _import_load_video(self, bin_folder, load_number, load_videos):
-        """Import the appropriate load video to the bin based on sorted order"""
+    def _queue_load_video(self, bin_folder, bin_name, load_number, load_videos, existing_clips, pending):
+        """Queue the appropriate load video for the bin based on sorted order"""
         if not load_videos:
-            self.gui.add_log_message("No load videos found to import\n")
+            self._log.debug("No load videos found to import\n")
             return False
         
         # Check if we have enough load videos
         if load_number > len(load_videos):
-            self.gui.add_log_message(f"Not enough load videos for L{load_number} (only {len(load_videos)} available)\n")
+            self._log.info("Not enough load videos for L%d (only %d available)\n", load_number, len(load_videos))
             return False
         
         # Get the corresponding load video (L1 = first in sorted list, etc.)
@@ -179,49 +273,65 @@ class BinCreatorApp:
         video_name = os.path.basename(video_path)
         
         # Check if load video already exists in bin
-        existing_clips = {clip.GetName() for clip in bin_folder.GetClipList()}
         if video_name in existing_clips:
-            self.gui.add_log_message(f"Load video already exists in bin: {video_name}\n")
+            self._log.debug("Load video already exists in bin: %s\n", video_name)
             return True
         
-        # Import the video
-        result = self.media_pool.ImportMedia([video_path])
-        
-        if not result:
-            self.gui.add_log_message(f"Failed to import load video: {video_name}\n")
-            return False
-        
-        # Move imported clip to the target bin
-        root_clip = self.media_pool.GetRootFolder()
-        for item in root_clip.GetClipList():
-            if item.GetName() == video_name:
-                self.media_pool.MoveClips([item], bin_folder)
-                self.gui.add_log_message(f"Imported load video {video_name} to L{load_number} bin\n")
-                return True
-        
-        #self.gui.add_log_message(f"Failed to move imported load video to bin\n")
-        return False
+        # Import it together with the bin's other missing files
+        self._add_pending(pending, bin_folder, bin_name, [video_path])
+        self._log.debug("Queued load video %s for L%d bin\n", video_name, load_number)
+        return True
     
-    def _import_vids(self, bin_folder, folder_path):
-        """Import videos to bin with logging"""
-        missing_files = self.get_missing_files(bin_folder, folder_path)
-        
+    def _queue_vids(self, bin_folder, bin_name, folder_path, missing_files, pending):
+        """Queue the videos missing from a bin for import"""
         if not missing_files:
-            self.gui.add_log_message(f"No missing files in: {bin_folder.GetName()}\n")
+            self._log.debug("No missing files in: %s\n", bin_name)
             return False
         
         video_files = [os.path.join(folder_path, f) for f in missing_files]
-        result = self.media_pool.ImportMedia(video_files)
-        
-        if not result:
-            self.gui.add_log_message(f"Failed to import missing files to: {bin_folder.GetName()}\n")
-            return False
+        self._add_pending(pending, bin_folder, bin_name, video_files)
+        self._log.debug("Queued %d files for: %s\n", len(missing_files), bin_name)
+        return True
+    
+    def _add_pending(self, pending, bin_folder, bin_name, file_paths):
+        """Add files to a bin's entry in the pending imports"""
+        pending.setdefault(id(bin_folder), (bin_folder, bin_name, []))[2].extend(file_paths)
+    
+    def _import_pending(self, pending, load_videos):
+        """Import the queued videos and load video of each bin with one call per bin.
         
-        # Move imported items to the target bin
-        root_clip = self.media_pool.GetRootFolder()
-        for item in root_clip.GetClipList():
-            if item.GetName() in missing_files:
-                self.media_pool.MoveClips([item], bin_folder)
+        Each import goes straight into its bin by making it the current Media Pool
+        folder; the previous current folder is restored once at the end.
+        Files that Resolve did not import are logged by name.
+        Returns the ids of the bins that received clips.
+        """
+        filled_bins = set()
+        if not pending:
+            return filled_bins
         
-        self.gui.add_log_message(f"Imported {len(missing_files)} files to: {bin_folder.GetName()}\n")
-        return True
\ No newline at end of file
+        previous = self.media_pool.GetCurrentFolder()
+        try:
+            for bin_id, (bin_folder, bin_name, video_files) in pending.items():
+                self.media_pool.SetCurrentFolder(bin_folder)
+                imported = self.media_pool.ImportMedia(video_files) or []
+                if len(imported) < len(video_files):
+                    self._log_failed_imports(bin_name, video_files, imported, load_videos)
+                if not imported:
+                    continue
+                filled_bins.add(bin_id)
+                self._log.debug("Imported %d files to: %s\n", len(imported), bin_name)
+        finally:
+            self.media_pool.SetCurrentFolder(previous)
+        return filled_bins
+    
+    def _log_failed_imports(self, bin_name, video_files, imported, load_videos):
+        """Log each queued file that is missing from the clips ImportMedia returned"""
+        imported_names = {clip.GetName() for clip in imported}
+        for path in video_files:
+            video_name = os.path.basename(path)
+            if video_name in imported_names:
+                continue
+            if path in load_videos:
+                self._log.info("Failed to import load video: %s\n", video_name)
+            else:
+                self._log.info("Failed to import %s to: %s\n", video_name, bin_name)
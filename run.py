@@ -5,10 +5,9 @@ from main import BinCreatorApp
 def main():
     root = tk.Tk()
     
-    # Create the app first, then pass it to the GUI
-    app = BinCreatorApp()  # We'll set the GUI reference later
-    gui = BinCreatorGUI(root, app)
-    app.gui = gui  # Complete the circular reference
+    # The GUI only needs the callbacks; it hands itself to the app on each run
+    app = BinCreatorApp()
+    BinCreatorGUI(root, app.create_media_bins, app.clear_scan_cache)
     
     root.mainloop()
 